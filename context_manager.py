@@ -1,17 +1,23 @@
 # context_manager.py
+from collections import deque
+
 class ContextManager:
     """Keep last n turns for multi-turn conversation."""
+
+    # Per-turn template bound once so add_turn does one C-level format call
+    _fmt = "User: {}\nBot: {}\n".format
+
     def __init__(self, max_history=5):
         self.max_history = max_history
-        self.history = []
+        # deque(maxlen=...) drops the oldest turn automatically, so add_turn
+        # is O(1) instead of paying a list shift via pop(0)
+        self.history = deque(maxlen=max_history)
+        # Turns pre-formatted at add time; get_context is then a single join
+        self._parts = deque(maxlen=max_history)
 
     def add_turn(self, user_text, bot_text):
         self.history.append((user_text, bot_text))
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
+        self._parts.append(self._fmt(user_text, bot_text))
 
     def get_context(self):
-        context_str = ""
-        for user, bot in self.history:
-            context_str += f"User: {user}\nBot: {bot}\n"
-        return context_str
+        return "".join(self._parts)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+One-shot export of the embedding model to ONNX for vector_store.py
+
+Writes the exported graph and tokenizer files into onnx/. When that
+directory exists, PolicyVectorStore picks ONNX Runtime over the torch
+SentenceTransformer pipeline automatically.
+
+Requires: pip install optimum[onnxruntime]
+"""
+from optimum.onnxruntime import ORTModelForFeatureExtraction
+from transformers import AutoTokenizer
+
+MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+OUTPUT_DIR = 'onnx'
+
+
+def convert_to_onnx(model_name=MODEL_NAME, output_dir=OUTPUT_DIR):
+    """Export the encoder and its tokenizer into output_dir."""
+    print(f"Exporting {model_name} to {output_dir}/ ...")
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+    print(f"✅ Export complete. vector_store.py will now use {output_dir}/model.onnx")
+
+
+if __name__ == '__main__':
+    convert_to_onnx()
@@ -1,16 +1,53 @@
 # main.py
+import os
+import threading
+
+try:
+    # Wires line editing + history into input(); not available everywhere
+    import readline
+except ImportError:
+    readline = None
+
 from response_generator import ResponseGenerator
 
+HISTORY_FILE = os.path.expanduser("~/.airline_bot_history")
+
+def _warm_up(bot):
+    """Run a tiny throwaway generation so model load happens while the user
+    is still typing their first question."""
+    try:
+        bot.chat_model.generate_response("hi", max_length=4)
+    except Exception:
+        pass  # warm-up is best-effort only
+
 def main():
     bot = ResponseGenerator()
     print("Airline Support Bot (type 'exit' to quit)\n")
 
-    while True:
-        user_input = input("You: ")
-        if user_input.lower() == 'exit':
-            break
-        response = bot.generate(user_input)
-        print(f"Bot: {response}\n")
+    # Hide model warm-up latency behind the first-input wait
+    threading.Thread(target=_warm_up, args=(bot,), daemon=True).start()
+
+    if readline is not None:
+        try:
+            readline.read_history_file(HISTORY_FILE)
+        except OSError:
+            pass  # no history yet
+
+    try:
+        while True:
+            user_input = input("You: ")
+            if user_input.lower() == 'exit':
+                break
+            print("Bot: ", end="", flush=True)
+            for token in bot.stream(user_input):
+                print(token, end="", flush=True)
+            print("\n")
+    finally:
+        if readline is not None:
+            try:
+                readline.write_history_file(HISTORY_FILE)
+            except OSError:
+                pass
 
 if __name__ == "__main__":
     main()
@@ -3,31 +3,154 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import asyncio
+import gzip
+import hashlib
 import json
 import time
 import os
 
+# Optional fast path: Playwright drives all URLs concurrently
+try:
+    from playwright.async_api import async_playwright
+    _HAVE_PLAYWRIGHT = True
+except Exception:
+    _HAVE_PLAYWRIGHT = False
+
+# Optional fast path: selectolax/lexbor parses HTML and runs CSS queries in C,
+# which is 5-20x faster than BeautifulSoup's Python tree build
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    _HAVE_SELECTOLAX = True
+except Exception:
+    _HAVE_SELECTOLAX = False
+
+# Optional: plain HTTP fetch for sections that render without JavaScript,
+# which skips the Chrome startup and page-load wait entirely
+try:
+    import requests
+    _HAVE_REQUESTS = True
+except Exception:
+    _HAVE_REQUESTS = False
+
+# Optional fast digest for dedupe sets: membership tests otherwise hash the
+# full multi-KB answer string; a 64-bit digest keys the set with small ints
+try:
+    from xxhash import xxh64_intdigest as _answer_key
+except Exception:
+    _answer_key = hash
+
+# lxml has a C tokenizer; html.parser is the pure-Python fallback
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = 'lxml'
+except Exception:
+    _BS_PARSER = 'html.parser'
+
+# Only materialize the <main> subtree — scripts, svg, header and footer are
+# thrown away anyway, so don't pay to build them
+MAIN_STRAINER = SoupStrainer("main")
+
+
+def _parse_main(page_source):
+    """Parse a full page but build only the <main> subtree."""
+    soup = BeautifulSoup(page_source, _BS_PARSER, parse_only=MAIN_STRAINER)
+    return soup.find('main')
+
+
+def _main_html(driver):
+    """outerHTML of <main> straight from the browser, or None."""
+    try:
+        return driver.execute_script(
+            "var m = document.querySelector('main'); return m ? m.outerHTML : null;"
+        )
+    except Exception:
+        return None
+
+
+def _main_soup(driver):
+    """Grab just <main>'s HTML from the browser and parse that.
+
+    Shipping the whole page_source over the driver connection and parsing
+    it again on every tab click is the expensive part; this keeps both the
+    transfer and the parse proportional to the main subtree."""
+    html = _main_html(driver)
+    if html is None:
+        # Fall back to shipping the whole page and straining it
+        return _parse_main(driver.page_source)
+    return BeautifulSoup(html, _BS_PARSER).find('main')
+
+
+# --- Disk cache for fetched HTML ---
+# Re-runs within a day replay the parsers off these gzipped snapshots and
+# skip Chrome and the network entirely; delete .cache/ to force a live scrape.
+_CACHE_DIR = '.cache'
+_CACHE_MAX_AGE = 24 * 3600
+
+
+def _cache_path(key):
+    return os.path.join(_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.html.gz')
+
+
+def _cache_read(key):
+    """Return the cached text for key, or None if absent or stale."""
+    path = _cache_path(key)
+    try:
+        if time.time() - os.stat(path).st_mtime >= _CACHE_MAX_AGE:
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _cache_write(key, text):
+    """Best-effort write; a failed cache write never fails the scrape."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        with gzip.open(_cache_path(key), 'wt', encoding='utf-8') as f:
+            f.write(text)
+    except OSError:
+        pass
+
+
+_TAB_INFO_JS = (
+    "return Array.from(document.querySelectorAll("
+    "\"button[role='tab'][id^='jb-tab-id-']\""
+    ")).map(b => [b.id, b.textContent.trim(), b.getAttribute('aria-controls')]);"
+)
+
+
+def _collect_tabs(driver):
+    """Fetch (id, label, panel id) for every tab in one browser round-trip.
+
+    Tab clicks go through getElementById afterwards, so the loops no
+    longer need to re-find the buttons on every iteration to dodge stale
+    element references."""
+    return driver.execute_script(_TAB_INFO_JS)
+
+
+import soupsieve as sv
+
+# Selectors compiled once at import; passing a selector string to
+# .select()/.select_one() re-parses it through soupsieve on every call
+SEL_TABLE_VISIBLE = sv.compile('jb-table div[role="table"].dn.db-ns')
+SEL_TABLE_ANY = sv.compile('jb-table div[role="table"]')
+SEL_QA_CONTAINER_BOTH = sv.compile(
+    'jb-body-text-container jb-inner-html.lh-copy, jb-body-text jb-inner-html.lh-copy'
+)
+
 # --- Helper Functions ---
 
 def clean_text(text):
     """Utility to clean whitespace from extracted text."""
     if not text:
         return ""
-    cleaned = text.replace('\xa0', ' ').strip()
-    lines = [line.strip() for line in cleaned.split('\n')]
-    cleaned_lines = [line for line in lines if line]
-    # Join lines back, handling list items slightly better
-    final_text = ""
-    for i, line in enumerate(cleaned_lines):
-        final_text += line
-        if i < len(cleaned_lines) - 1:
-            # Add newline if it looks like a list item, otherwise space
-            if line.startswith(('-', '•', '')) or cleaned_lines[i+1].startswith(('-', '•', '')):
-                     final_text += "\n"
-            else:
-                     final_text += " "
-    return ' '.join(final_text.split()) # Final cleanup
+    # Collapse all whitespace in one split/join pass. The old per-line
+    # concatenation loop inserted newlines for list items only to erase
+    # them again in its final ' '.join(...).split() cleanup.
+    return ' '.join(text.replace('\xa0', ' ').split())
 
 def clean_answer_text_preserve_newlines(text):
     """Cleans up whitespace while preserving intentional newlines for lists."""
@@ -35,6 +158,141 @@ def clean_answer_text_preserve_newlines(text):
     cleaned_lines = [line for line in lines if line]
     return '\n'.join(cleaned_lines)
 
+def _text_nl(tag):
+    """Newline-joined text of a BS4 node via .stripped_strings.
+
+    One traversal that strips and drops empty strings as it goes, instead
+    of get_text(separator='\\n', strip=True) followed by a second
+    per-line strip/filter pass."""
+    return '\n'.join(tag.stripped_strings)
+
+# --- Lexbor (selectolax) Parsing Helpers ---
+# C-level equivalents of the BeautifulSoup parse_* paths below. They take raw
+# HTML strings; the public parse_* functions dispatch here when possible.
+
+def _lexbor_faq_pairs(containers):
+    """Extract h3-question / p-ul-answer pairs from lexbor container nodes."""
+    faq_list = []
+    processed_answers = set()
+    for container in containers:
+        question_tag = container.css_first('h3')
+        if not question_tag:
+            continue
+        question = clean_text(question_tag.text(deep=True, strip=True))
+        answer_parts = []
+        node = question_tag.next
+        while node is not None:
+            if node.tag == 'h3':
+                break  # Stop at next question
+            if node.tag in ('p', 'ul'):
+                answer_parts.append(node.text(deep=True, separator='\n', strip=True))
+            node = node.next
+        if answer_parts:
+            answer = clean_answer_text_preserve_newlines('\n'.join(answer_parts))
+            if question and answer:
+                key = _answer_key(answer)
+                if key not in processed_answers:
+                    faq_list.append({"question": question, "answer": answer})
+                    processed_answers.add(key)
+    return faq_list
+
+
+def _parse_fare_table_lexbor(html, context_name):
+    tree = LexborHTMLParser(html)
+    table_div = (tree.css_first('jb-table div[role="table"].dn.db-ns')
+                 or tree.css_first('jb-table div[role="table"]'))
+    if not table_div:
+        print(f"         - Info: Could not find the main fare comparison table structure for '{context_name}'.")
+        return None
+
+    headers = []
+    header_row = table_div.css_first('div[role="rowgroup"] > div[role="row"]')
+    if header_row:
+        header_cells = header_row.css('div[role="columnheader"]')
+        headers = [clean_text(th.text(deep=True, strip=True)) for th in header_cells[1:]]
+    if not headers:
+        print(f"         - Warning: Could not extract table headers for '{context_name}'.")
+        return None
+
+    row_groups = table_div.css('div[role="rowgroup"]')
+    if len(row_groups) < 2:
+        print(f"         - Warning: Could not find table body row group for '{context_name}'.")
+        return None
+
+    qa_pairs = []
+    for row in row_groups[1].css('div[role="row"]'):
+        cells = row.css('div[role="cell"]')
+        if not cells:
+            continue
+        feature_name_tag = cells[0].css_first('div.s-body')
+        feature_name = clean_text((feature_name_tag or cells[0]).text(deep=True, strip=True))
+        if not feature_name:
+            continue
+        for i, header in enumerate(headers):
+            if (i + 1) < len(cells):
+                answer = clean_text(cells[i + 1].text(deep=True, separator=' ', strip=True))
+                if feature_name and header and (answer or answer == "0"):
+                    question = f"For a '{context_name}', what is the policy for '{feature_name}' with a '{header}' fare?"
+                    qa_pairs.append({"question": question, "answer": answer})
+    return qa_pairs if qa_pairs else None
+
+
+def _parse_faqs_lexbor(html):
+    tree = LexborHTMLParser(html)
+    containers = tree.css('jb-body-text-container jb-inner-html.lh-copy, jb-body-text jb-inner-html.lh-copy')
+    print(f"         - Info: Found {len(containers)} potential Q&A containers for FAQs.")
+    faq_list = _lexbor_faq_pairs(containers)
+    print(f"         - Info: Extracted {len(faq_list)} unique FAQ pairs.")
+    return faq_list if faq_list else None
+
+
+def _parse_pet_tab_panel_lexbor(html):
+    tree = LexborHTMLParser(html)
+    answer_tag = tree.css_first('jb-inner-html')
+    target = answer_tag if answer_tag is not None else tree.body
+    if target is None:
+        return None
+    answer = clean_answer_text_preserve_newlines(target.text(deep=True, separator='\n', strip=True))
+    return answer if answer else None
+
+
+def _parse_pet_static_lexbor(html):
+    tree = LexborHTMLParser(html)
+    qa_pairs = []
+    processed_answers = set()
+
+    checklist_section = tree.css_first('div#pet-travel-checklist')
+    if checklist_section:
+        question_tag = checklist_section.css_first('h2')
+        answer_tag = checklist_section.css_first('jb-inner-html')
+        if question_tag and answer_tag:
+            question = clean_text(question_tag.text(deep=True, strip=True))
+            intro_text = ""
+            node = question_tag.next
+            while node is not None:
+                if node.tag == 'p':
+                    intro_text = clean_answer_text_preserve_newlines(node.text(deep=True, separator='\n', strip=True))
+                    break
+                node = node.next
+            list_text = clean_answer_text_preserve_newlines(answer_tag.text(deep=True, separator='\n', strip=True))
+            answer = f"{intro_text}\n{list_text}".strip()
+            if question and answer:
+                qa_pairs.append({"question": question, "answer": answer})
+                processed_answers.add(_answer_key(answer))
+                print(f"         - Info: Parsed 'Pet Travel Checklist' section.")
+
+    containers = tree.css('jb-body-text-container jb-inner-html.lh-copy, jb-body-text jb-inner-html.lh-copy')
+    print(f"         - Info: Found {len(containers)} potential general Q&A containers.")
+    initial_qa_count = len(qa_pairs)
+    for pair in _lexbor_faq_pairs(containers):
+        key = _answer_key(pair['answer'])
+        if key not in processed_answers:
+            qa_pairs.append(pair)
+            processed_answers.add(key)
+    print(f"         - Info: Extracted {len(qa_pairs) - initial_qa_count} unique general Q&A pairs.")
+    return qa_pairs if qa_pairs else None
+
+
 # --- Fares Page Parsing ---
 
 def parse_fare_table(soup_section, context_name):
@@ -42,38 +300,46 @@ def parse_fare_table(soup_section, context_name):
     Parses the fare comparison table and converts it into a
     list of Question-Answer pairs for the RAG, using the
     provided context (e.g., tab name).
+
+    Accepts either raw HTML (fast lexbor path) or a BeautifulSoup node.
     """
     print(f"         - Parsing fare table for context: '{context_name}'")
+    if isinstance(soup_section, str):
+        if _HAVE_SELECTOLAX:
+            return _parse_fare_table_lexbor(soup_section, context_name)
+        soup_section = BeautifulSoup(soup_section, _BS_PARSER)
     qa_pairs = []
-    table_div = soup_section.select_one('jb-table div[role="table"].dn.db-ns')
+    table_div = SEL_TABLE_VISIBLE.select_one(soup_section)
     if not table_div:
         # Try finding any visible table as a fallback
-        table_div = soup_section.select_one('jb-table div[role="table"]')
+        table_div = SEL_TABLE_ANY.select_one(soup_section)
     
     if not table_div:
         print(f"         - Info: Could not find the main fare comparison table structure for '{context_name}'.")
         return None
 
+    # One walk over the direct children: rowgroup 0 holds the header row,
+    # rowgroup 1 the body rows, instead of three separate selector queries
+    rowgroups = table_div.find_all('div', attrs={'role': 'rowgroup'}, recursive=False)
+    if len(rowgroups) < 2:
+        print(f"         - Warning: Could not find table body row group for '{context_name}'.")
+        return None
+
     headers = []
-    header_row = table_div.select_one('div[role="rowgroup"] > div[role="row"]')
+    header_row = rowgroups[0].find('div', attrs={'role': 'row'}, recursive=False)
     if header_row:
-        header_cells = header_row.select('div[role="columnheader"]')
+        header_cells = header_row.find_all('div', attrs={'role': 'columnheader'}, recursive=False)
         # Get fare types (e.g., "Blue Basic", "Blue")
-        headers = [clean_text(th.get_text(strip=True)) for th in header_cells[1:]] 
+        headers = [clean_text(th.get_text(strip=True)) for th in header_cells[1:]]
 
     if not headers:
         print(f"         - Warning: Could not extract table headers for '{context_name}'.")
         return None
 
-    body_row_group = table_div.select_one('div[role="rowgroup"]:nth-of-type(2)')
-    if not body_row_group:
-        print(f"         - Warning: Could not find table body row group for '{context_name}'.")
-        return None
+    rows = rowgroups[1].find_all('div', attrs={'role': 'row'}, recursive=False)
 
-    rows = body_row_group.select('div[role="row"]')
-    
     for row in rows:
-        cells = row.select('div[role="cell"]')
+        cells = row.find_all('div', attrs={'role': 'cell'}, recursive=False)
         if not cells: continue
 
         # Get the feature name (e.g., "Checked bag(s) included")
@@ -100,14 +366,18 @@ def parse_fare_table(soup_section, context_name):
 
 
 def parse_faqs(soup_section):
-    """Parses Question (h3) and Answer (following p/ul) pairs."""
+    """Parses Question (h3) and Answer (following p/ul) pairs.
+
+    Accepts either raw HTML (fast lexbor path) or a BeautifulSoup node."""
+    if isinstance(soup_section, str):
+        if _HAVE_SELECTOLAX:
+            return _parse_faqs_lexbor(soup_section)
+        soup_section = BeautifulSoup(soup_section, _BS_PARSER)
     faq_list = []
-    # Look within specific containers first
-    qa_containers = soup_section.select('jb-body-text-container jb-inner-html.lh-copy')
-    if not qa_containers:
-        # Fallback to broader search if specific structure not found
-        qa_containers = soup_section.select('jb-body-text jb-inner-html.lh-copy')
-        
+    # One union selector covers both container structures in a single
+    # tree walk (soupsieve returns each node at most once)
+    qa_containers = SEL_QA_CONTAINER_BOTH.select(soup_section)
+
     print(f"         - Info: Found {len(qa_containers)} potential Q&A containers for FAQs.")
 
     processed_faq_answers = set() # Avoid duplicates within FAQs
@@ -120,13 +390,15 @@ def parse_faqs(soup_section):
             answer_parts = []
             for elem in answer_elements:
                 if elem.name == 'h3': break
-                answer_parts.append(elem.get_text(separator='\n', strip=True))
+                answer_parts.append(_text_nl(elem))
 
             if answer_parts:
-                answer = clean_answer_text_preserve_newlines('\n'.join(answer_parts))
-                if question and answer and answer not in processed_faq_answers:
-                    faq_list.append({"question": question, "answer": answer})
-                    processed_faq_answers.add(answer)
+                answer = '\n'.join(p for p in answer_parts if p)
+                if question and answer:
+                    key = _answer_key(answer)
+                    if key not in processed_faq_answers:
+                        faq_list.append({"question": question, "answer": answer})
+                        processed_faq_answers.add(key)
 
     print(f"         - Info: Extracted {len(faq_list)} unique FAQ pairs.")
     return faq_list if faq_list else None
@@ -137,14 +409,19 @@ def parse_pet_tab_panel(panel_soup):
     """
     (NEW FUNCTION)
     Parses the content of a single pet travel tab panel.
+
+    Accepts either raw HTML (fast lexbor path) or a BeautifulSoup node.
     """
+    if isinstance(panel_soup, str):
+        if _HAVE_SELECTOLAX:
+            return _parse_pet_tab_panel_lexbor(panel_soup)
+        panel_soup = BeautifulSoup(panel_soup, _BS_PARSER)
     answer_tag = panel_soup.find('jb-inner-html') # Content is inside this
     if answer_tag:
-        answer = clean_answer_text_preserve_newlines(answer_tag.get_text(strip=True, separator='\n'))
-        return answer
-    
+        return _text_nl(answer_tag)
+
     # Fallback: just get all text from the panel if jb-inner-html isn't found
-    answer = clean_answer_text_preserve_newlines(panel_soup.get_text(strip=True, separator='\n'))
+    answer = _text_nl(panel_soup)
     return answer if answer else None
 
 def parse_pet_page_static_content(soup_section):
@@ -152,7 +429,13 @@ def parse_pet_page_static_content(soup_section):
     (RENAMED & MODIFIED)
     Parses non-tabbed Q&A (Checklist, general FAQs) for the Pet Travel page.
     Returns a list of {"question": ..., "answer": ...} dicts.
+
+    Accepts either raw HTML (fast lexbor path) or a BeautifulSoup node.
     """
+    if isinstance(soup_section, str):
+        if _HAVE_SELECTOLAX:
+            return _parse_pet_static_lexbor(soup_section)
+        soup_section = BeautifulSoup(soup_section, _BS_PARSER)
     qa_pairs = []
     processed_answers = set()
 
@@ -166,16 +449,18 @@ def parse_pet_page_static_content(soup_section):
 
             if question_tag and answer_tag:
                 question = clean_text(question_tag.get_text(strip=True))
-                intro_text = clean_answer_text_preserve_newlines(intro_p.get_text(strip=True, separator='\n')) if intro_p else ""
-                list_text = clean_answer_text_preserve_newlines(answer_tag.get_text(strip=True, separator='\n'))
+                intro_text = _text_nl(intro_p) if intro_p else ""
+                list_text = _text_nl(answer_tag)
                 
                 # Combine intro and list for the answer
                 answer = f"{intro_text}\n{list_text}".strip()
 
-                if question and answer and answer not in processed_answers:
-                    qa_pairs.append({"question": question, "answer": answer})
-                    processed_answers.add(answer)
-                    print(f"         - Info: Parsed 'Pet Travel Checklist' section.")
+                if question and answer:
+                    key = _answer_key(answer)
+                    if key not in processed_answers:
+                        qa_pairs.append({"question": question, "answer": answer})
+                        processed_answers.add(key)
+                        print(f"         - Info: Parsed 'Pet Travel Checklist' section.")
     except Exception as e:
         print(f"         - Warning: Could not parse specific 'Pet Travel Checklist' section. {e}")
 
@@ -184,7 +469,7 @@ def parse_pet_page_static_content(soup_section):
 
 
     # --- Strategy 3: General Q&A Blocks (h3 -> p/ul) ---
-    qa_containers = soup_section.select('jb-body-text-container jb-inner-html.lh-copy, jb-body-text jb-inner-html.lh-copy')
+    qa_containers = SEL_QA_CONTAINER_BOTH.select(soup_section)
     print(f"         - Info: Found {len(qa_containers)} potential general Q&A containers.")
     
     initial_qa_count = len(qa_pairs)
@@ -198,14 +483,16 @@ def parse_pet_page_static_content(soup_section):
             answer_parts = []
             for elem in answer_elements:
                 if elem.name == 'h3': break # Stop at next question
-                answer_parts.append(elem.get_text(separator='\n', strip=True))
+                answer_parts.append(_text_nl(elem))
 
             if answer_parts:
-                answer = clean_answer_text_preserve_newlines('\n'.join(answer_parts))
+                answer = '\n'.join(p for p in answer_parts if p)
                 # Add if question, answer exist and answer is unique
-                if question and answer and answer not in processed_answers:
-                    qa_pairs.append({"question": question, "answer": answer})
-                    processed_answers.add(answer)
+                if question and answer:
+                    key = _answer_key(answer)
+                    if key not in processed_answers:
+                        qa_pairs.append({"question": question, "answer": answer})
+                        processed_answers.add(key)
                         
     found_general_qa = len(qa_pairs) - initial_qa_count
     print(f"         - Info: Extracted {found_general_qa} unique general Q&A pairs.")
@@ -215,251 +502,624 @@ def parse_pet_page_static_content(soup_section):
 
 # --- Main Scraping Function ---
 
-def scrape_policy_pages(urls, wait_time=12):
-    """
-    Scrape policy pages using Selenium, parsing tables & FAQs for 'Fares',
-    Q&A for 'Pet Travel', and text for others.
-    """
+def _chrome_options():
+    """Build headless Chrome options (Options objects are not picklable,
+    so each worker builds its own)."""
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    return chrome_options
 
-    driver = webdriver.Chrome(options=chrome_options)
-    policies = {}
 
-    for section, url in urls.items():
-        print(f"\nScraping section '{section}' from {url} ...")
+def _scrape_section_with_driver(driver, section, url, wait_time=12):
+    """Scrape a single section with an already-running driver."""
+    print(f"\nScraping section '{section}' from {url} ...")
+    try:
+        driver.get(url)
+        WebDriverWait(driver, wait_time).until(
+            EC.presence_of_element_located((By.TAG_NAME, "main"))
+        )
+        # Wait for real content blocks instead of a blind 3s sleep
         try:
-            driver.get(url)
             WebDriverWait(driver, wait_time).until(
-                EC.presence_of_element_located((By.TAG_NAME, "main"))
+                EC.presence_of_element_located((
+                    By.CSS_SELECTOR,
+                    "main jb-table div[role='table'], main jb-body-text, main jb-inner-html",
+                ))
             )
-            time.sleep(3) # Extra wait for initial JS rendering
-        except Exception as e:
-            print(f"   - Error: Failed to load page or find main content for '{section}'. Skipping. Error: {e}")
-            policies[section] = f"Error: Could not load page or find main content. {e}"
-            continue
+        except Exception:
+            pass  # some pages legitimately have none of these blocks
+    except Exception as e:
+        print(f"   - Error: Failed to load page or find main content for '{section}'. Skipping. Error: {e}")
+        return f"Error: Could not load page or find main content. {e}"
 
-        section_data = None
+    section_data = None
 
-        # --- Fares Page Logic (No changes) ---
-        if section == "Fares":
-            print(f"   - Parsing specific content for '{section}'...")
-            section_data_list = [] # Initialize an empty list
-            
-            # 1. Find all fare tabs
-            try:
-                tab_buttons = driver.find_elements(By.CSS_SELECTOR, "button[role='tab'][id^='jb-tab-id-']")
-                if not tab_buttons:
-                    print("     - Info: No tabs found. Parsing as a single page.")
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    main_content = soup.find('main')
-                    
-                    table_result = parse_fare_table(main_content, "General") # Pass a default context
-                    if table_result:
-                        section_data_list.extend(table_result)
-                        print(f"     - Success: Parsed table into {len(table_result)} Q&A pairs.")
-                    else:
-                        print(f"     - Warning: Could not parse fare table.")
-                else:
-                    print(f"     - Info: Found {len(tab_buttons)} tabs. Iterating...")
-                    # 2. Iterate through each tab, click, and parse
-                    for i in range(len(tab_buttons)):
-                        tab_buttons = driver.find_elements(By.CSS_SELECTOR, "button[role='tab'][id^='jb-tab-id-']")
-                        tab_button = tab_buttons[i]
-                        
-                        try:
-                            tab_name = clean_text(tab_button.text)
-                            if not tab_name:
-                                tab_name = f"Tab {i+1}" # Fallback
-                                
-                            print(f"     - Clicking tab: '{tab_name}'")
-                            
-                            driver.execute_script("arguments[0].click();", tab_button)
-                            time.sleep(3) 
-                            
-                            soup = BeautifulSoup(driver.page_source, 'html.parser')
-                            main_content = soup.find('main')
-                            
-                            if not main_content:
-                                print(f"     - Error: Could not find main content after clicking tab '{tab_name}'.")
-                                continue
-
-                            table_result = parse_fare_table(main_content, tab_name)
-                            if table_result:
-                                section_data_list.extend(table_result)
-                                print(f"         - Success: Parsed table for '{tab_name}', got {len(table_result)} Q&A pairs.")
-                            else:
-                                print(f"         - Warning: Could not parse fare table for '{tab_name}'.")
-                                
-                        except Exception as e:
-                            tab_name_for_error = tab_name if 'tab_name' in locals() else f"Tab {i}"
-                            print(f"     - Error processing '{tab_name_for_error}': {e}")
-                            continue # Skip to next tab
-
-            except Exception as e:
-                print(f"     - Error finding tabs: {e}. Will attempt to parse as a single page.")
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                main_content = soup.find('main')
+    # --- Fares Page Logic (No changes) ---
+    if section == "Fares":
+        print(f"   - Parsing specific content for '{section}'...")
+        section_data_list = [] # Initialize an empty list
+        
+        # 1. Find all fare tabs
+        try:
+            tab_infos = _collect_tabs(driver)
+            _cache_write(url + '#tabs', json.dumps(tab_infos))
+            if not tab_infos:
+                print("     - Info: No tabs found. Parsing as a single page.")
+                main_content = _main_soup(driver)
+                
                 table_result = parse_fare_table(main_content, "General") # Pass a default context
                 if table_result:
                     section_data_list.extend(table_result)
                     print(f"     - Success: Parsed table into {len(table_result)} Q&A pairs.")
-
-            # 4. Parse the regular FAQs (which are likely outside the tabs)
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            main_content = soup.find('main')
-            if main_content:
-                faq_result = parse_faqs(main_content)
-                if faq_result:
-                    section_data_list.extend(faq_result)
-                    print(f"     - Success: Parsed {len(faq_result)} general FAQs.")
                 else:
-                    print(f"     - Info: No general FAQs found or failed to parse.")
+                    print(f"     - Warning: Could not parse fare table.")
             else:
-                 print("     - Warning: Could not find main content to parse FAQs.")
-
-            # 5. Check if we gathered any Q&A pairs at all
-            if not section_data_list:
-                print(f"     - Warning: No structured data found for '{section}'. Falling back to general text.")
-                if 'main_content' not in locals() or not main_content:
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    main_content = soup.find('main')
-                
-                if main_content:
-                    section_data = clean_text(main_content.get_text(separator=' ', strip=True)) # Fallback to text
-                    print(f"     - Scraped {len(section_data)} characters (approx) as fallback.")
-                else:
-                    section_data = "Error: Fallback failed, main content not found."
+                print(f"     - Info: Found {len(tab_infos)} tabs. Iterating...")
+                # 2. Iterate through each tab, click by ID, and parse
+                for i, (tab_id, tab_label, panel_id) in enumerate(tab_infos):
+                    try:
+                        tab_name = clean_text(tab_label)
+                        if not tab_name:
+                            tab_name = f"Tab {i+1}" # Fallback
+
+                        print(f"     - Clicking tab: '{tab_name}'")
+
+                        driver.execute_script(
+                            "document.getElementById(arguments[0]).click();", tab_id)
+                        # Wait until the clicked tab's panel is shown
+                        # rather than sleeping a fixed 3s
+                        if panel_id:
+                            try:
+                                WebDriverWait(driver, 10).until(
+                                    lambda d: d.find_element(By.ID, panel_id).get_attribute('aria-hidden') != 'true'
+                                )
+                            except Exception:
+                                pass
+
+                        main_html = _main_html(driver)
+
+                        if not main_html:
+                            print(f"     - Error: Could not find main content after clicking tab '{tab_name}'.")
+                            continue
+                        _cache_write(f"{url}#tab-{tab_id}", main_html)
+
+                        table_result = parse_fare_table(main_html, tab_name)
+                        if table_result:
+                            section_data_list.extend(table_result)
+                            print(f"         - Success: Parsed table for '{tab_name}', got {len(table_result)} Q&A pairs.")
+                        else:
+                            print(f"         - Warning: Could not parse fare table for '{tab_name}'.")
+                            
+                    except Exception as e:
+                        tab_name_for_error = tab_name if 'tab_name' in locals() else f"Tab {i}"
+                        print(f"     - Error processing '{tab_name_for_error}': {e}")
+                        continue # Skip to next tab
+
+        except Exception as e:
+            print(f"     - Error finding tabs: {e}. Will attempt to parse as a single page.")
+            main_content = _main_soup(driver)
+            table_result = parse_fare_table(main_content, "General") # Pass a default context
+            if table_result:
+                section_data_list.extend(table_result)
+                print(f"     - Success: Parsed table into {len(table_result)} Q&A pairs.")
+
+        # 4. Parse the regular FAQs (which are likely outside the tabs)
+        main_html = _main_html(driver)
+        if main_html:
+            _cache_write(url + '#main', main_html)
+            faq_result = parse_faqs(main_html)
+            if faq_result:
+                section_data_list.extend(faq_result)
+                print(f"     - Success: Parsed {len(faq_result)} general FAQs.")
             else:
-                section_data = section_data_list # Assign the combined list
+                print(f"     - Info: No general FAQs found or failed to parse.")
+        else:
+             print("     - Warning: Could not find main content to parse FAQs.")
 
-        # --- Pet Travel Page Logic (HEAVILY MODIFIED) ---
-        elif section == "Pet Travel":
-            print(f"   - Parsing specific content for '{section}'...")
-            section_data_list = []
+        # 5. Check if we gathered any Q&A pairs at all
+        if not section_data_list:
+            print(f"     - Warning: No structured data found for '{section}'. Falling back to general text.")
+            main_content = _parse_main(main_html) if main_html else _main_soup(driver)
             
-            # 1. Parse static content (Checklist, general FAQs) first
-            try:
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                main_content = soup.find('main')
-                if main_content:
-                    # Use the modified function that only gets static content
-                    static_qa = parse_pet_page_static_content(main_content) 
-                    if static_qa:
-                        section_data_list.extend(static_qa)
-                        print(f"     - Success: Parsed {len(static_qa)} static Q&A pairs (Checklist, FAQs).")
-                else:
-                    print("     - Warning: Could not find main content for static parsing.")
-            except Exception as e:
-                print(f"     - Warning: Error parsing static content: {e}")
+            if main_content:
+                section_data = clean_text(main_content.get_text(separator=' ', strip=True)) # Fallback to text
+                print(f"     - Scraped {len(section_data)} characters (approx) as fallback.")
+            else:
+                section_data = "Error: Fallback failed, main content not found."
+        else:
+            section_data = section_data_list # Assign the combined list
 
-            # 2. Find and parse dynamic tabs
-            try:
-                tab_buttons = driver.find_elements(By.CSS_SELECTOR, "button[role='tab'][id^='jb-tab-id-']")
-                if not tab_buttons:
-                    print("     - Info: No dynamic tabs found.")
-                else:
-                    print(f"     - Info: Found {len(tab_buttons)} tabs. Iterating...")
-                    processed_tab_answers = set() # Avoid duplicates from tabs
-                    
-                    for i in range(len(tab_buttons)):
-                        # Re-find elements to avoid stale reference
-                        tab_buttons = driver.find_elements(By.CSS_SELECTOR, "button[role='tab'][id^='jb-tab-id-']")
-                        tab_button = tab_buttons[i]
+    # --- Pet Travel Page Logic (HEAVILY MODIFIED) ---
+    elif section == "Pet Travel":
+        print(f"   - Parsing specific content for '{section}'...")
+        section_data_list = []
+        
+        # 1. Parse static content (Checklist, general FAQs) first
+        try:
+            main_html = _main_html(driver)
+            if main_html:
+                _cache_write(url + '#main', main_html)
+                # Use the modified function that only gets static content
+                static_qa = parse_pet_page_static_content(main_html)
+                if static_qa:
+                    section_data_list.extend(static_qa)
+                    print(f"     - Success: Parsed {len(static_qa)} static Q&A pairs (Checklist, FAQs).")
+            else:
+                print("     - Warning: Could not find main content for static parsing.")
+        except Exception as e:
+            print(f"     - Warning: Error parsing static content: {e}")
+
+        # 2. Find and parse dynamic tabs
+        try:
+            tab_infos = _collect_tabs(driver)
+            _cache_write(url + '#tabs', json.dumps(tab_infos))
+            if not tab_infos:
+                print("     - Info: No dynamic tabs found.")
+            else:
+                print(f"     - Info: Found {len(tab_infos)} tabs. Iterating...")
+                processed_tab_answers = set() # Avoid duplicates from tabs
+
+                for i, (tab_id, tab_label, tab_panel_id) in enumerate(tab_infos):
+                    try:
+                        tab_name = clean_text(tab_label) # This is the QUESTION
+
+                        if not tab_name or not tab_panel_id:
+                            print(f"     - Warning: Skipping tab {i} (no name or panel ID).")
+                            continue
+
+                        print(f"     - Clicking tab: '{tab_name}'")
+                        driver.execute_script(
+                            "document.getElementById(arguments[0]).click();", tab_id)
                         
+                        # Wait for the panel content to be loaded/visible
                         try:
-                            tab_name = clean_text(tab_button.text) # This is the QUESTION
-                            tab_panel_id = tab_button.get_attribute('aria-controls')
-                            
-                            if not tab_name or not tab_panel_id:
-                                print(f"     - Warning: Skipping tab {i} (no name or panel ID).")
-                                continue
+                            WebDriverWait(driver, 10).until(
+                                lambda d: d.find_element(By.ID, tab_panel_id).get_attribute('aria-hidden') != 'true'
+                            )
+                        except Exception:
+                            pass
 
-                            print(f"     - Clicking tab: '{tab_name}'")
-                            driver.execute_script("arguments[0].click();", tab_button)
-                            
-                            # Wait for the panel content to be loaded/visible
-                            time.sleep(2) 
+                        # Find the specific panel by its ID
+                        panel_element = driver.find_element(By.ID, tab_panel_id)
+                        panel_html = panel_element.get_attribute('innerHTML')
+                        _cache_write(f"{url}#panel-{tab_panel_id}", panel_html)
 
-                            # Find the specific panel by its ID
-                            panel_element = driver.find_element(By.ID, tab_panel_id)
-                            panel_html = panel_element.get_attribute('innerHTML')
-                            panel_soup = BeautifulSoup(panel_html, 'html.parser')
-                            
-                            # Use the new helper function to parse the panel's content
-                            answer = parse_pet_tab_panel(panel_soup) 
+                        # Use the new helper function to parse the panel's content
+                        answer = parse_pet_tab_panel(panel_html)
+                        
+                        if tab_name and answer and answer not in processed_tab_answers:
+                            section_data_list.append({"question": tab_name, "answer": answer})
+                            processed_tab_answers.add(answer)
+                            print(f"         - Success: Parsed Q&A for tab '{tab_name}'.")
+                        elif not answer:
+                            print(f"         - Info: Tab '{tab_name}' had no content.")
                             
-                            if tab_name and answer and answer not in processed_tab_answers:
-                                section_data_list.append({"question": tab_name, "answer": answer})
-                                processed_tab_answers.add(answer)
-                                print(f"         - Success: Parsed Q&A for tab '{tab_name}'.")
-                            elif not answer:
-                                print(f"         - Info: Tab '{tab_name}' had no content.")
-                                
-                        except Exception as e:
-                            tab_name_for_error = tab_name if 'tab_name' in locals() else f"Tab {i}"
-                            print(f"     - Error processing '{tab_name_for_error}': {e}")
-                            continue # Skip to next tab
+                    except Exception as e:
+                        tab_name_for_error = tab_name if 'tab_name' in locals() else f"Tab {i}"
+                        print(f"     - Error processing '{tab_name_for_error}': {e}")
+                        continue # Skip to next tab
+        
+        except Exception as e:
+            print(f"     - Error finding tabs: {e}.")
+
+        # 3. Final check and fallback
+        if not section_data_list:
+            print(f"   - Warning: No structured data found for '{section}'. Falling back to general text.")
+            # Rebuild main soup from cached html, or refetch on error paths
+            main_html = locals().get('main_html')
+            main_content = _parse_main(main_html) if main_html else _main_soup(driver)
             
-            except Exception as e:
-                print(f"     - Error finding tabs: {e}.")
-
-            # 3. Final check and fallback
-            if not section_data_list:
-                print(f"   - Warning: No structured data found for '{section}'. Falling back to general text.")
-                # Find main_content again in case it was lost in error paths
-                if 'main_content' not in locals() or not main_content:
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    main_content = soup.find('main')
-                
-                if main_content:
-                    section_data = clean_text(main_content.get_text(separator=' ', strip=True)) # Fallback to text
-                    print(f"     - Scraped {len(section_data)} characters (approx) as fallback.")
-                else:
-                    section_data = "Error: Fallback failed, main content not found."
+            if main_content:
+                section_data = clean_text(main_content.get_text(separator=' ', strip=True)) # Fallback to text
+                print(f"     - Scraped {len(section_data)} characters (approx) as fallback.")
             else:
-                section_data = section_data_list # Assign the combined list
+                section_data = "Error: Fallback failed, main content not found."
+        else:
+            section_data = section_data_list # Assign the combined list
 
-        
-        # --- Default text extraction for other pages (No changes) ---
+    
+    # --- Default text extraction for other pages (No changes) ---
+    else:
+        print(f"   - Extracting general text content for '{section}'...")
+        main_html = _main_html(driver)
+        if main_html:
+            _cache_write(url + '#main', main_html)
+        main_content = _parse_main(main_html) if main_html else _main_soup(driver)
+        if not main_content:
+             print(f"   - Error: Could not find main content tag for '{section}'. Skipping.")
+             return "Error: Main content tag not found."
+
+        section_data = _general_text(main_content, section)
+
+    return section_data
+
+
+def _general_text(main_content, section):
+    """Default text extraction, shared by the browser and HTTP paths."""
+    # Try specific content blocks first
+    content_blocks = main_content.find_all(['jb-body-text', 'jb-inner-html'])
+    text = ""
+    if content_blocks:
+        processed_texts = [_text_nl(block) for block in content_blocks]
+        text = '\n\n'.join(processed_texts)
+
+    if not text.strip():
+        print(f"     - Info: No specific content blocks found. Using main text fallback for '{section}'.")
+        text = clean_text(main_content.get_text(separator=' ', strip=True))
+
+    print(f"     - Scraped {len(text)} characters (approx) for '{section}'.")
+    return text
+
+
+# Sections whose content only appears after client-side JavaScript runs;
+# everything else is served as static HTML and can skip the browser
+_DYNAMIC_SECTIONS = {"Fares", "Pet Travel"}
+
+
+def _scrape_static(session, section, url, timeout=10):
+    """Fetch a static page over plain HTTP and extract its general text."""
+    print(f"\nScraping section '{section}' from {url} (static) ...")
+    try:
+        resp = session.get(url, timeout=timeout)
+        resp.raise_for_status()
+    except Exception as e:
+        print(f"   - Error: Failed to fetch page for '{section}'. Skipping. Error: {e}")
+        return f"Error: Could not load page or find main content. {e}"
+
+    _cache_write(url + '#main', resp.text)
+    main_content = BeautifulSoup(resp.content, _BS_PARSER, parse_only=MAIN_STRAINER).find('main')
+    if not main_content:
+        print(f"   - Error: Could not find main content tag for '{section}'. Skipping.")
+        return "Error: Main content tag not found."
+
+    print(f"   - Extracting general text content for '{section}'...")
+    return _general_text(main_content, section)
+
+
+def _scrape_section_from_cache(section, url):
+    """Rebuild one section from the HTML cache without touching the network.
+
+    Returns None on any miss or stale entry so the caller falls through to
+    a live scrape. The parse_* helpers all accept raw HTML strings, so the
+    cached snapshots replay through exactly the same parsing code."""
+    main_html = _cache_read(url + '#main')
+    if main_html is None:
+        return None
+
+    if section == "Fares":
+        tabs_raw = _cache_read(url + '#tabs')
+        if tabs_raw is None:
+            return None
+        tab_infos = json.loads(tabs_raw)
+        data = []
+        if not tab_infos:
+            table_result = parse_fare_table(main_html, "General")
+            if table_result:
+                data.extend(table_result)
+        for i, (tab_id, tab_label, panel_id) in enumerate(tab_infos):
+            tab_html = _cache_read(f"{url}#tab-{tab_id}")
+            if tab_html is None:
+                return None
+            table_result = parse_fare_table(tab_html, clean_text(tab_label) or f"Tab {i+1}")
+            if table_result:
+                data.extend(table_result)
+        faq_result = parse_faqs(main_html)
+        if faq_result:
+            data.extend(faq_result)
+        return data if data else None
+
+    if section == "Pet Travel":
+        tabs_raw = _cache_read(url + '#tabs')
+        if tabs_raw is None:
+            return None
+        data = parse_pet_page_static_content(main_html) or []
+        processed_tab_answers = set()
+        for i, (tab_id, tab_label, tab_panel_id) in enumerate(json.loads(tabs_raw)):
+            tab_name = clean_text(tab_label)
+            if not tab_name or not tab_panel_id:
+                continue
+            panel_html = _cache_read(f"{url}#panel-{tab_panel_id}")
+            if panel_html is None:
+                return None
+            answer = parse_pet_tab_panel(panel_html)
+            if answer and answer not in processed_tab_answers:
+                data.append({"question": tab_name, "answer": answer})
+                processed_tab_answers.add(answer)
+        return data if data else None
+
+    main_content = _parse_main(main_html)
+    return _general_text(main_content, section) if main_content else None
+
+
+def _scrape_section(args):
+    """Worker entry point: one Chrome per process, since WebDriver is not
+    thread-safe and sections are independent."""
+    section, url, wait_time = args
+    driver = webdriver.Chrome(options=_chrome_options())
+    try:
+        return section, _scrape_section_with_driver(driver, section, url, wait_time)
+    finally:
+        driver.quit()
+
+
+# Sections land here one line at a time as they finish scraping; a crash
+# mid-run keeps everything done so far, and downstream consumers can start
+# on finished sections before the whole scrape completes.
+_PARTIAL_JSONL = 'policies.partial.jsonl'
+
+
+def _append_section(jsonl_f, section, data):
+    """Persist one finished section to the line-buffered sidecar."""
+    jsonl_f.write(json.dumps({"section": section, "data": data}, ensure_ascii=False) + "\n")
+
+
+def scrape_policy_pages(urls, wait_time=12):
+    """
+    Scrape policy pages using Selenium, parsing tables & FAQs for 'Fares',
+    Q&A for 'Pet Travel', and text for others.
+
+    Static sections (outside _DYNAMIC_SECTIONS) are fetched over plain
+    HTTP; Chrome only starts when a dynamic section is present. With more
+    than one dynamic URL, those are scraped in parallel with one headless
+    Chrome per worker process (I/O-bound, near-linear speedup). Each
+    section is flushed to the partial-results sidecar as it finishes.
+    """
+    # Sections whose HTML is still cached from a recent run replay without
+    # touching the browser or the network at all
+    policies = {}
+    pending = {}
+    for section, url in urls.items():
+        cached = _scrape_section_from_cache(section, url)
+        if cached is not None:
+            print(f"\nSection '{section}': reusing cached HTML from a previous run.")
+            policies[section] = cached
         else:
-            print(f"   - Extracting general text content for '{section}'...")
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            main_content = soup.find('main')
-            if not main_content:
-                 print(f"   - Error: Could not find main content tag for '{section}'. Skipping.")
-                 policies[section] = "Error: Main content tag not found."
-                 continue
-                 
-            # Try specific content blocks first
-            content_blocks = main_content.find_all(['jb-body-text', 'jb-inner-html'])
-            text = ""
-            if content_blocks:
-                processed_texts = []
-                for block in content_blocks:
-                    block_text = block.get_text(separator='\n', strip=True)
-                    lines = [line.strip() for line in block_text.split('\n')]
-                    cleaned_lines = [line for line in lines if line]
-                    processed_texts.append('\n'.join(cleaned_lines))
-                text = '\n\n'.join(processed_texts)
-                
-            if not text.strip():
-                print(f"     - Info: No specific content blocks found. Using main text fallback for '{section}'.")
-                text = clean_text(main_content.get_text(separator=' ', strip=True))
+            pending[section] = url
 
-            section_data = text
-            print(f"     - Scraped {len(text)} characters (approx) for '{section}'.")
+    # Without requests installed everything goes through the browser
+    dynamic = {s: u for s, u in pending.items()
+               if s in _DYNAMIC_SECTIONS or not _HAVE_REQUESTS}
+    static = {s: u for s, u in pending.items() if s not in dynamic}
 
-        policies[section] = section_data
+    with open(_PARTIAL_JSONL, 'w', encoding='utf-8', buffering=1) as jsonl_f:
+        for section in policies:
+            _append_section(jsonl_f, section, policies[section])
+        if static:
+            session = requests.Session()
+            for section, url in static.items():
+                policies[section] = _scrape_static(session, section, url)
+                _append_section(jsonl_f, section, policies[section])
+
+        if len(dynamic) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            max_workers = min(len(dynamic), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as ex:
+                for section, data in ex.map(_scrape_section, [(s, u, wait_time) for s, u in dynamic.items()]):
+                    policies[section] = data
+                    _append_section(jsonl_f, section, data)
+        elif dynamic:
+            driver = webdriver.Chrome(options=_chrome_options())
+            try:
+                for section, url in dynamic.items():
+                    policies[section] = _scrape_section_with_driver(driver, section, url, wait_time)
+                    _append_section(jsonl_f, section, policies[section])
+            finally:
+                driver.quit()
 
-    driver.quit()
     print("\nFinished scraping all sections.")
     return policies
 
+# --- Playwright Scraping (concurrent fast path) ---
+
+_TAB_SELECTOR = "button[role='tab'][id^='jb-tab-id-']"
+
+
+async def _scrape_one(browser, section, url, wait_time=12):
+    """Scrape one section in its own browser context.
+
+    Waits are event-driven (wait_for_selector / networkidle) so they return
+    as soon as the content actually renders, instead of fixed sleeps."""
+    timeout_ms = wait_time * 1000
+    ctx = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    page = await ctx.new_page()
+    try:
+        print(f"\nScraping section '{section}' from {url} ...")
+        try:
+            await page.goto(url, timeout=timeout_ms)
+            await page.wait_for_selector("main", timeout=timeout_ms)
+            try:
+                await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+            except Exception:
+                pass  # page kept polling; main is present, carry on
+        except Exception as e:
+            print(f"   - Error: Failed to load page or find main content for '{section}'. Skipping. Error: {e}")
+            return section, f"Error: Could not load page or find main content. {e}"
+
+        async def main_html():
+            # outerHTML so cached snapshots replay through _parse_main,
+            # which expects the <main> tag itself to be present
+            return await page.eval_on_selector("main", "el => el.outerHTML")
+
+        async def collect_tabs():
+            return await page.eval_on_selector_all(
+                _TAB_SELECTOR,
+                "els => els.map(b => [b.id, b.textContent.trim(),"
+                " b.getAttribute('aria-controls')])",
+            )
+
+        # --- Fares Page Logic ---
+        if section == "Fares":
+            print(f"   - Parsing specific content for '{section}'...")
+            section_data_list = []
+
+            tab_infos = await collect_tabs()
+            _cache_write(url + '#tabs', json.dumps(tab_infos))
+            if not tab_infos:
+                print("     - Info: No tabs found. Parsing as a single page.")
+                table_result = parse_fare_table(await main_html(), "General")
+                if table_result:
+                    section_data_list.extend(table_result)
+            else:
+                print(f"     - Info: Found {len(tab_infos)} tabs. Iterating...")
+                for i, (tab_id, tab_label, panel_id) in enumerate(tab_infos):
+                    # Bound before the try: the handler below formats it even
+                    # when the very first statement is what raised
+                    tab_name = clean_text(tab_label) or f"Tab {i+1}"
+                    try:
+                        print(f"     - Clicking tab: '{tab_name}'")
+                        # Click by the id collected up front; no per-click
+                        # re-query of the tab strip, and a re-render that
+                        # drops a button just fails this one tab
+                        await page.click(f"#{tab_id}" if tab_id
+                                         else f"{_TAB_SELECTOR} >> nth={i}")
+                        if panel_id:
+                            try:
+                                await page.wait_for_selector(f"#{panel_id}:not([hidden])", timeout=timeout_ms)
+                            except Exception:
+                                pass
+                        tab_html = await main_html()
+                        if tab_id:
+                            _cache_write(f"{url}#tab-{tab_id}", tab_html)
+                        table_result = parse_fare_table(tab_html, tab_name)
+                        if table_result:
+                            section_data_list.extend(table_result)
+                            print(f"         - Success: Parsed table for '{tab_name}', got {len(table_result)} Q&A pairs.")
+                    except Exception as e:
+                        print(f"     - Error processing '{tab_name}': {e}")
+                        continue
+
+            page_html = await main_html()
+            _cache_write(url + '#main', page_html)
+            faq_result = parse_faqs(page_html)
+            if faq_result:
+                section_data_list.extend(faq_result)
+                print(f"     - Success: Parsed {len(faq_result)} general FAQs.")
+
+            if section_data_list:
+                return section, section_data_list
+            print(f"     - Warning: No structured data found for '{section}'. Falling back to general text.")
+            soup = BeautifulSoup(page_html, _BS_PARSER)
+            return section, clean_text(soup.get_text(separator=' ', strip=True))
+
+        # --- Pet Travel Page Logic ---
+        if section == "Pet Travel":
+            print(f"   - Parsing specific content for '{section}'...")
+            section_data_list = []
+
+            page_html = await main_html()
+            _cache_write(url + '#main', page_html)
+            static_qa = parse_pet_page_static_content(page_html)
+            if static_qa:
+                section_data_list.extend(static_qa)
+                print(f"     - Success: Parsed {len(static_qa)} static Q&A pairs (Checklist, FAQs).")
+
+            tab_infos = await collect_tabs()
+            _cache_write(url + '#tabs', json.dumps(tab_infos))
+            processed_tab_answers = set()
+            for i, (tab_id, tab_label, tab_panel_id) in enumerate(tab_infos):
+                try:
+                    tab_name = clean_text(tab_label)
+                    if not tab_name or not tab_panel_id:
+                        print(f"     - Warning: Skipping tab {i} (no name or panel ID).")
+                        continue
+                    print(f"     - Clicking tab: '{tab_name}'")
+                    await page.click(f"#{tab_id}" if tab_id
+                                     else f"{_TAB_SELECTOR} >> nth={i}")
+                    try:
+                        await page.wait_for_selector(f"#{tab_panel_id}:not([hidden])", timeout=timeout_ms)
+                    except Exception:
+                        pass
+                    panel_html = await page.inner_html(f"#{tab_panel_id}")
+                    _cache_write(f"{url}#panel-{tab_panel_id}", panel_html)
+                    answer = parse_pet_tab_panel(panel_html)
+                    if tab_name and answer and answer not in processed_tab_answers:
+                        section_data_list.append({"question": tab_name, "answer": answer})
+                        processed_tab_answers.add(answer)
+                        print(f"         - Success: Parsed Q&A for tab '{tab_name}'.")
+                except Exception as e:
+                    print(f"     - Error processing tab {i}: {e}")
+                    continue
+
+            if section_data_list:
+                return section, section_data_list
+            print(f"   - Warning: No structured data found for '{section}'. Falling back to general text.")
+            soup = BeautifulSoup(await main_html(), _BS_PARSER)
+            return section, clean_text(soup.get_text(separator=' ', strip=True))
+
+        # --- Default text extraction for other pages ---
+        print(f"   - Extracting general text content for '{section}'...")
+        page_html = await main_html()
+        _cache_write(url + '#main', page_html)
+        soup = BeautifulSoup(page_html, _BS_PARSER)
+        return section, _general_text(soup, section)
+    finally:
+        await ctx.close()
+
+
+async def _scrape_all(urls, wait_time=12, on_done=None):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            tasks = [_scrape_one(browser, section, url, wait_time)
+                     for section, url in urls.items()]
+            results = []
+            for task in asyncio.as_completed(tasks):
+                section, data = await task
+                if on_done is not None:
+                    on_done(section, data)
+                results.append((section, data))
+        finally:
+            await browser.close()
+    return dict(results)
+
+
+def scrape_policy_pages_playwright(urls, wait_time=12):
+    """
+    Scrape all policy pages concurrently with Playwright: one browser, one
+    context per URL, pages loading in parallel. I/O-bound, so wall time is
+    roughly that of the slowest page rather than the sum of all of them.
+
+    Shares the orchestration of scrape_policy_pages: recently cached
+    sections replay without a browser, static sections go over plain HTTP,
+    and every finished section is flushed to the partial-results sidecar.
+    """
+    policies = {}
+    pending = {}
+    for section, url in urls.items():
+        cached = _scrape_section_from_cache(section, url)
+        if cached is not None:
+            print(f"\nSection '{section}': reusing cached HTML from a previous run.")
+            policies[section] = cached
+        else:
+            pending[section] = url
+
+    dynamic = {s: u for s, u in pending.items()
+               if s in _DYNAMIC_SECTIONS or not _HAVE_REQUESTS}
+    static = {s: u for s, u in pending.items() if s not in dynamic}
+
+    with open(_PARTIAL_JSONL, 'w', encoding='utf-8', buffering=1) as jsonl_f:
+        for section in policies:
+            _append_section(jsonl_f, section, policies[section])
+        if static:
+            session = requests.Session()
+            for section, url in static.items():
+                policies[section] = _scrape_static(session, section, url)
+                _append_section(jsonl_f, section, policies[section])
+        if dynamic:
+            scraped = asyncio.run(_scrape_all(
+                dynamic, wait_time,
+                on_done=lambda section, data: _append_section(jsonl_f, section, data),
+            ))
+            policies.update(scraped)
+
+    print("\nFinished scraping all sections.")
+    return policies
+
+
 # --- Saving Function (No changes needed) ---
 def save_policies(policies, filename='policies.json'):
     """Saves the scraped policies dictionary to a JSON file."""
@@ -480,5 +1140,9 @@ if __name__ == "__main__":
         "Pet Travel": "https://www.jetblue.com/traveling-together/traveling-with-pets"
     }
 
-    policies = scrape_policy_pages(urls)
+    # Prefer the concurrent Playwright path; keep Selenium as the fallback
+    if _HAVE_PLAYWRIGHT:
+        policies = scrape_policy_pages_playwright(urls)
+    else:
+        policies = scrape_policy_pages(urls)
     save_policies(policies)
\ No newline at end of file
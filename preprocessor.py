@@ -1,11 +1,12 @@
 # preprocessor.py
 import re
 
+# Compiled once at import; clean_text runs on every user turn
+_WS = re.compile(r'\s+')        # extra spaces
+_PUNCT = re.compile(r'[^\w\s]')  # punctuation
+
 def clean_text(text):
     """
     Clean user input text
     """
-    text = text.lower().strip()
-    text = re.sub(r'\s+', ' ', text)  # remove extra spaces
-    text = re.sub(r'[^\w\s]', '', text)  # remove punctuation
-    return text
+    return _PUNCT.sub('', _WS.sub(' ', text.lower().strip()))
@@ -1,5 +1,6 @@
 # response_generator.py
 import json
+from functools import lru_cache
 from preprocessor import clean_text
 from conversation_model import ChatModel
 from context_manager import ContextManager
@@ -13,11 +14,39 @@ except Exception:
     _HAVE_RAG = False
 
 
+# Sentinel the LLM emits for off-topic questions; folding the intent check
+# into the answer prompt saves a whole LLM round-trip per turn
+_OOS_SENTINEL = "OUT_OF_SCOPE"
+
+_REFUSAL = ("I'm an airline customer support assistant. I can only help with "
+            "flight bookings, baggage, cancellations, pets, fares, and other "
+            "airline-related questions. Please ask something related to air travel.")
+
+
 class ResponseGenerator:
     def __init__(self, policy_file='policies.json', policies_jsonl='policies.jsonl', index_dir='vector_index'):
         # Load static policies (fallback)
         with open(policy_file, 'r', encoding='utf-8') as f:
             self.policies = json.load(f)
+        # Joined once here; the fallback prompt path otherwise re-serializes
+        # the whole policy corpus on every turn
+        self._all_policies_text = "Airline Policies:\n" + '\n'.join(
+            str(v) for v in self.policies.values()
+        )
+
+        # The instruction block never changes between turns; assemble it once
+        # so _build_prompt only concatenates the per-turn pieces
+        self._prompt_prefix = f"""You are a helpful airline customer support assistant. Answer questions using ONLY the policy information provided below.
+
+IMPORTANT INSTRUCTIONS:
+- If the question is NOT about airlines, flights, travel, or airline customer service, reply with exactly: {_OOS_SENTINEL}
+- Keep answers SHORT and DIRECT (2-4 sentences maximum)
+- Only include the most relevant information
+- Use bullet points only if listing multiple items
+- Don't repeat information
+- Be conversational but concise
+
+"""
 
         self.context_manager = ContextManager()
         self.chat_model = ChatModel()
@@ -27,96 +56,128 @@ class ResponseGenerator:
         if _HAVE_RAG:
             try:
                 store = PolicyVectorStore()
-                # Try to load existing index, if not found it will build later
+                loaded = False
                 if os.path.exists(index_dir):
-                    store.load_index(cache_dir=index_dir)
-                    self.vector_store = store
-                    print("✅ RAG vector store loaded successfully")
-                elif os.path.exists(policies_jsonl):
-                    # Build index for first time using JSONL file
-                    print("Building RAG index for first time...")
-                    store.build_index(policies_file=policies_jsonl, cache_dir=index_dir)
-                    self.vector_store = store
-                    print("✅ RAG index built and loaded")
-                else:
-                    print(f"Info: {policies_jsonl} not found, RAG not available")
+                    try:
+                        store.load_index(cache_dir=index_dir)
+                        loaded = True
+                        print("✅ RAG vector store loaded successfully")
+                    except Exception as e:
+                        # Cache dir exists but isn't loadable (e.g. an older
+                        # on-disk format): rebuild below instead of silently
+                        # running without RAG forever
+                        print(f"Info: cached index unusable ({e}), rebuilding...")
+                if not loaded:
+                    if os.path.exists(policies_jsonl):
+                        print("Building RAG index...")
+                        store.build_index(policies_file=policies_jsonl, cache_dir=index_dir)
+                        print("✅ RAG index built and loaded")
+                    else:
+                        print(f"Info: {policies_jsonl} not found, RAG not available")
+                        store = None
+                self.vector_store = store
             except Exception as e:
                 # If loading fails, keep fallback
                 print(f"Info: RAG not available, using static policies. ({e})")
 
-    def _is_airline_related(self, user_input: str) -> bool:
-        """Check if the user query is related to airline/travel topics."""
-        # Quick check using LLM
-        prompt = f"""Is this question related to airlines, flights, travel, or customer service? Answer only 'YES' or 'NO'.
+        # Vector retrieval costs an encoder round-trip per call and inputs
+        # repeat verbatim after clean_text normalization, so memoize it
+        # per instance; the embedding is cached separately so a changed
+        # top_k/max_distance still reuses the encoder forward pass
+        self._retrieve = lru_cache(maxsize=256)(self._retrieve)
+        if self.vector_store is not None:
+            self._embed_cached = lru_cache(maxsize=1024)(self.vector_store.embed_query)
+
+    def _retrieve(self, query: str, top_k: int = 3, min_score: float = None):
+        """Vector search, memoized on its arguments in __init__."""
+        vec = self._embed_cached(query)
+        return self.vector_store.retrieve_by_vector(vec, top_k=top_k, min_score=min_score)
 
-Question: {user_input}
 
-Answer:"""
-        response = self.chat_model.generate_response(prompt).strip().upper()
-        return response.startswith('YES')
-    
     def _build_prompt(self, user_input_clean: str, conversation_context: str) -> str:
         """Build prompt including policy context when available."""
         policy_context = ''
         if self.vector_store:
             try:
-                # Retrieve relevant policies using vector search
-                results = self.vector_store.retrieve(user_input_clean, top_k=3)
-                
+                # Retrieve relevant policies using vector search. The
+                # threshold is applied inside the store; cosine >= 0 matches
+                # the old L2-distance-below-2.0 cutoff on unit vectors
+                results = self._retrieve(user_input_clean, top_k=3, min_score=0.0)
+
                 # Display retrieved policies with distances
                 if results:
                     print(f"\n📋 Retrieved {len(results)} relevant policies:")
                     for r in results:
-                        print(f"  • [{r['section']}] (distance: {r['distance']:.3f})")
+                        print(f"  • [{r['section']}] (score: {r['score']:.3f})")
                         print(f"    Q: {r['question'][:80]}...")
-                
-                # Build context from retrieved results
-                policy_parts = []
-                for r in results:
-                    if r['distance'] < 2.0:  # Only include good matches
-                        policy_parts.append(f"Q: {r['question']}\nA: {r['answer']}")
-                
-                policy_context = '\n\n'.join(policy_parts)
-                
+
+                policy_context = '\n\n'.join(f"Q: {r['question']}\nA: {r['answer']}" for r in results)
+
             except Exception as e:
                 print(f"Warning: vector store search failed: {e}")
 
         if policy_context:
             policy_text = f"Relevant Airline Policies:\n{policy_context}"
+        elif self.vector_store:
+            # Retrieval worked but nothing matched: a short marker keeps the
+            # prompt tiny instead of stuffing the whole corpus into it
+            policy_text = "Relevant Airline Policies:\n(no matching policy found)"
         else:
-            # Fallback to all policies if retrieval failed
-            policy_text = "Airline Policies:\n" + '\n'.join(self.policies.values())
+            # Fallback to all policies when RAG is unavailable
+            policy_text = self._all_policies_text
 
-        # Build final prompt with instructions for the LLM
-        prompt = f"""You are a helpful airline customer support assistant. Answer questions using ONLY the policy information provided below.
-
-IMPORTANT INSTRUCTIONS:
-- Keep answers SHORT and DIRECT (2-4 sentences maximum)
-- Only include the most relevant information
-- Use bullet points only if listing multiple items
-- Don't repeat information
-- Be conversational but concise
-
-{policy_text}
-
-{conversation_context}User: {user_input_clean}
-Bot:"""
-        return prompt
+        # Final prompt = cached instruction block + the three variable pieces
+        return (self._prompt_prefix + policy_text + "\n\n"
+                + conversation_context + "User: " + user_input_clean + "\nBot:")
 
     def generate(self, user_input: str) -> str:
         user_input_clean = clean_text(user_input)
-        
-        # Check if question is airline-related BEFORE retrieval
-        if not self._is_airline_related(user_input_clean):
-            return "I'm an airline customer support assistant. I can only help with flight bookings, baggage, cancellations, pets, fares, and other airline-related questions. Please ask something related to air travel."
-        
+
         conversation_context = self.context_manager.get_context()
 
         prompt = self._build_prompt(user_input_clean, conversation_context)
 
-        # Generate response
+        # Generate response; off-topic questions come back as the sentinel
         bot_response = self.chat_model.generate_response(prompt)
+        if bot_response.strip().startswith(_OOS_SENTINEL):
+            return _REFUSAL
 
         # Update conversation context
         self.context_manager.add_turn(user_input_clean, bot_response)
         return bot_response
+
+    def stream(self, user_input: str):
+        """Yield the bot reply in chunks as the model produces them."""
+        user_input_clean = clean_text(user_input)
+
+        conversation_context = self.context_manager.get_context()
+
+        prompt = self._build_prompt(user_input_clean, conversation_context)
+
+        # Stream the response, holding output back only until we can tell
+        # whether the model emitted the out-of-scope sentinel
+        chunks = []
+        buffering = True
+        for chunk in self.chat_model.stream_response(prompt):
+            chunks.append(chunk)
+            if buffering:
+                text = ''.join(chunks).lstrip()
+                if _OOS_SENTINEL.startswith(text[:len(_OOS_SENTINEL)]):
+                    if text.startswith(_OOS_SENTINEL):
+                        yield _REFUSAL
+                        return
+                    continue  # could still be a sentinel prefix, keep buffering
+                buffering = False
+                yield ''.join(chunks)
+            else:
+                yield chunk
+
+        if buffering:
+            # Reply ended while still shorter than the sentinel
+            text = ''.join(chunks)
+            if text.strip().startswith(_OOS_SENTINEL):
+                yield _REFUSAL
+                return
+            yield text
+
+        self.context_manager.add_turn(user_input_clean, ''.join(chunks))
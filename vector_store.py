@@ -15,7 +15,10 @@ Usage:
 import os
 import json
 import numpy as np
+import pickle
+import threading
 import time
+from concurrent.futures import Future
 
 # Optional imports with fallback
 try:
@@ -26,6 +29,31 @@ except Exception as e:
     _HAVE_RAG = False
     _RAG_IMPORT_ERROR = e
 
+if _HAVE_RAG:
+    # Torch can default to a single intra-op thread depending on the build;
+    # pin it to the core count once at import
+    try:
+        import torch
+        torch.set_num_threads(os.cpu_count() or 1)
+    except Exception:
+        pass
+
+# Optional: orjson parses and encodes JSON in C; stdlib json is the fallback
+try:
+    import orjson
+    _HAVE_ORJSON = True
+except Exception:
+    _HAVE_ORJSON = False
+
+# Optional: ONNX Runtime runs an exported encoder with fused kernels, much
+# faster on CPU than the torch pipeline (see convert_to_onnx.py)
+try:
+    import onnxruntime
+    from transformers import AutoTokenizer
+    _HAVE_ONNX = True
+except Exception:
+    _HAVE_ONNX = False
+
 
 def _ensure_rag_available():
     if not _HAVE_RAG:
@@ -37,14 +65,134 @@ def _ensure_rag_available():
 # Helper: Load JSONL file
 def load_jsonl(path):
     """Load JSONL file - one JSON object per line"""
-    rows = []
+    if _HAVE_ORJSON:
+        # One read + splitlines instead of iterating the file object: line
+        # splitting happens in C in a single pass and the comprehension
+        # skips a readline dispatch per row. orjson takes the raw bytes
+        with open(path, 'rb') as f:
+            return [orjson.loads(line) for line in f.read().splitlines()
+                    if line and not line.isspace()]
     with open(path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-    return rows
+        return [json.loads(line) for line in f.read().splitlines() if line.strip()]
+
+
+# Below this many vectors the HNSW graph build never pays for itself and
+# brute force is already sub-millisecond
+_HNSW_MIN_VECTORS = 2000
+
+# Rows handed to index.add per call; bounds FAISS's transient copy during
+# the build to ~25 MB of float32 at MiniLM dimensions
+_ADD_CHUNK_ROWS = 16384
+
+# One encoder per model name, shared across every PolicyVectorStore in the
+# process: inference is read-only, and a second copy costs the full weight
+# load plus the duplicate memory
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+
+# Directory convert_to_onnx.py exports into; when present, ONNX Runtime is
+# preferred over SentenceTransformer for the encoder
+_ONNX_DIR = 'onnx'
+
+
+class _OnnxEncoder:
+    """encode()-compatible shim around an exported ONNX encoder.
+
+    Mean-pools the token embeddings under the attention mask and optionally
+    L2-normalizes, matching the SentenceTransformer pipeline for
+    all-MiniLM-L6-v2, so the rest of the store doesn't care which backend
+    produced the vectors."""
+
+    def __init__(self, model_dir):
+        so = onnxruntime.SessionOptions()
+        so.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        so.intra_op_num_threads = os.cpu_count() or 1
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, 'model.onnx'),
+            sess_options=so,
+            providers=['CPUExecutionProvider'],
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True,
+               normalize_embeddings=False, show_progress_bar=False):
+        # Sort by length so each micro-batch pads to its own max sequence
+        # length instead of the global one (attention cost is quadratic in
+        # padded length); the same trick SentenceTransformer.encode uses
+        order = np.argsort([len(t) for t in texts])
+        sorted_texts = [texts[i] for i in order]
+        out = []
+        for start in range(0, len(sorted_texts), batch_size):
+            batch = self.tokenizer(sorted_texts[start:start + batch_size],
+                                   padding=True, truncation=True,
+                                   return_tensors='np')
+            feeds = {k: v for k, v in batch.items() if k in self._input_names}
+            token_embs = self.session.run(None, feeds)[0]
+            mask = batch['attention_mask'][..., None].astype(np.float32)
+            pooled = (token_embs * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            out.append(pooled)
+        embs = np.concatenate(out, axis=0).astype(np.float32)
+        # Undo the sort so rows line up with the input order again
+        inv = np.empty_like(order)
+        inv[order] = np.arange(len(order))
+        embs = embs[inv]
+        if normalize_embeddings:
+            embs /= np.linalg.norm(embs, axis=1, keepdims=True) + 1e-12
+        return embs
+
+
+class EncoderQueue:
+    """Coalesces concurrent encode requests into one model forward.
+
+    Concurrent callers each paying a one-row forward is the encoder's worst
+    case: N times the fixed per-call cost for N vectors. The queue holds
+    each submission for a few milliseconds so simultaneous requests pile
+    into a single batched encode, then resolves every caller's Future with
+    its own row. Only worth wiring up for server-style concurrent use; the
+    single-threaded REPL path doesn't need it."""
+
+    def __init__(self, store, flush_interval_ms: int = 5, max_batch: int = 64):
+        self._store = store
+        self._interval = flush_interval_ms / 1000.0
+        self._max_batch = max_batch
+        self._pending = []
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._drain, daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue one text; the Future resolves to its (1, d) embedding."""
+        fut = Future()
+        with self._cond:
+            self._pending.append((text, fut))
+            self._cond.notify()
+        return fut
+
+    def _drain(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Hold the batch open briefly so other threads that are
+                # submitting right now land in this forward instead of
+                # the next one
+                self._cond.wait(timeout=self._interval)
+                batch = self._pending[:self._max_batch]
+                del self._pending[:self._max_batch]
+            try:
+                vecs = self._store.model.encode(
+                    [text for text, _ in batch],
+                    batch_size=len(batch),
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                )
+                vecs = np.ascontiguousarray(vecs, dtype=np.float32)
+                for (_, fut), row in zip(batch, vecs):
+                    fut.set_result(row[None, :])
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
 
 
 class PolicyVectorStore:
@@ -54,7 +202,9 @@ class PolicyVectorStore:
     - Returns ANSWERS as results
     """
     
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', use_gpu: bool = False,
+                 quantize: bool = False, quantize_model: bool = False,
+                 preload: bool = False):
         _ensure_rag_available()
         self.model_name = model_name
         self.model = None  # Lazy load
@@ -63,14 +213,124 @@ class PolicyVectorStore:
         self.answers = []    # List of answers (what we return)
         self.sections = []   # List of section names (metadata)
         self.embeddings = None
+        # Set once build_index/load_index completes; the flat case keeps
+        # self.index at None (NumPy searches the matrix directly), so index
+        # presence can't double as the readiness check
+        self._loaded = False
+        # GPU search only pays off for batched queries (retrieve_batch);
+        # faiss-cpu builds report zero GPUs and stay on the CPU path
+        self._use_gpu = (use_gpu and hasattr(faiss, 'get_num_gpus')
+                         and faiss.get_num_gpus() > 0)
+        # Opt-in int8 storage; spot-check recall@k on real queries before
+        # turning this on for a new corpus
+        self._quantize = quantize
+        # Opt-in dynamic int8 for the encoder itself on CPU (quantize above
+        # covers the index); ignored when the model runs on CUDA
+        self._quantize_model = quantize_model
+        # E5/BGE-family models are trained with these prefixes; MiniLM is
+        # not, so there they only add tokens and skew the embedding
+        needs_prefix = any(k in model_name.lower() for k in ('e5', 'bge', 'gte'))
+        self._passage_prefix = 'passage: ' if needs_prefix else ''
+        self._query_prefix = 'query: ' if needs_prefix else ''
+        # Batching queue for retrieve_async, started on first use
+        self._encoder_queue = None
+        self._queue_lock = threading.Lock()
+
+        if preload:
+            # Load and warm the encoder now so the first real query doesn't
+            # pay model load plus cold-start forward latency; long-running
+            # server processes should construct with preload=True
+            self._load_model()
+            self.model.encode(["warmup"], convert_to_numpy=True)
         
+    def _maybe_to_gpu(self):
+        """Clone the built CPU index onto GPU 0 when requested and present."""
+        if not self._use_gpu:
+            return
+        built_flat = False
+        try:
+            if self.index is None:
+                # Flat indexes are never materialized on the CPU (the NumPy
+                # path searches the matrix directly); build the FAISS copy
+                # only now that GPU placement actually needs one
+                self.index = faiss.IndexFlatIP(self.embeddings.shape[1])
+                for i in range(0, len(self.embeddings), _ADD_CHUNK_ROWS):
+                    self.index.add(np.ascontiguousarray(
+                        self.embeddings[i:i + _ADD_CHUNK_ROWS], dtype=np.float32))
+                built_flat = True
+            self._gpu_res = faiss.StandardGpuResources()
+            self.index = faiss.index_cpu_to_gpu(self._gpu_res, 0, self.index)
+            print("✅ FAISS index moved to GPU")
+        except Exception as e:
+            print(f"Info: could not move index to GPU, staying on CPU. ({e})")
+            self._use_gpu = False
+            if built_flat:
+                # Drop the CPU copy again; the NumPy path takes over
+                self.index = None
+
     def _load_model(self):
-        """Lazy load the embedding model"""
-        if self.model is None:
-            print(f"Loading embedding model: {self.model_name}...")
-            self.model = SentenceTransformer(self.model_name)
-            print("✅ Model loaded")
+        """Lazy load the embedding model, preferring an exported ONNX graph"""
+        if self.model is not None:
+            return
+        if _HAVE_ONNX and os.path.isdir(_ONNX_DIR):
+            try:
+                print(f"Loading ONNX embedding model from {_ONNX_DIR}/...")
+                with _MODEL_LOCK:
+                    model = _MODEL_CACHE.get(f"onnx:{_ONNX_DIR}")
+                    if model is None:
+                        model = _OnnxEncoder(_ONNX_DIR)
+                        _MODEL_CACHE[f"onnx:{_ONNX_DIR}"] = model
+                self.model = model
+                print("✅ ONNX model loaded")
+                return
+            except Exception as e:
+                print(f"Info: ONNX model unusable, using SentenceTransformer. ({e})")
+        print(f"Loading embedding model: {self.model_name}...")
+        cache_key = self.model_name + (':int8' if self._quantize_model else '')
+        with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(cache_key)
+            if model is None:
+                model = SentenceTransformer(self.model_name)
+                # Older sentence-transformers builds resolve a slow pure-
+                # Python tokenizer; the Rust one is ~10x faster, which is
+                # most of the per-query cost for short inputs
+                try:
+                    if not getattr(model.tokenizer, 'is_fast', True):
+                        from transformers import AutoTokenizer as _Tok
+                        model.tokenizer = _Tok.from_pretrained(
+                            self.model_name, use_fast=True)
+                except Exception:
+                    pass
+                try:
+                    import torch
+                    if torch.cuda.is_available():
+                        # FP16 roughly doubles tensor-core throughput; the
+                        # cosine drift is negligible and encode still
+                        # L2-normalizes the output, so IP scores stay exact
+                        model = model.half().to('cuda')
+                    elif self._quantize_model:
+                        # Dynamic int8 on the Linear layers halves CPU
+                        # inference bytes; weights quantize once, activations
+                        # per batch
+                        model = torch.quantization.quantize_dynamic(
+                            model, {torch.nn.Linear}, dtype=torch.qint8)
+                except Exception as e:
+                    print(f"Info: mixed-precision setup skipped. ({e})")
+                _MODEL_CACHE[cache_key] = model
+        self.model = model
+        print("✅ Model loaded")
     
+    def _index_from_cache(self, embeddings_path: str, index_path: str):
+        """Restore search state for a cached embedding matrix.
+
+        A flat IP index is byte-for-byte the embedding matrix, so it is
+        neither persisted nor rebuilt: the memmapped matrix itself backs
+        the NumPy search path, and a FAISS copy only materializes if GPU
+        placement asks for one (_maybe_to_gpu). HNSW and quantized indexes
+        carry real extra state and still come from disk."""
+        self.embeddings = np.load(embeddings_path, mmap_mode='r')
+        self.index = faiss.read_index(index_path) if os.path.exists(index_path) else None
+
     def build_index(self, policies_file: str = 'policies.jsonl', cache_dir: str = 'vector_index'):
         """Build FAISS index from policies.jsonl - embeds QUESTIONS, returns ANSWERS"""
         _ensure_rag_available()
@@ -81,20 +341,23 @@ class PolicyVectorStore:
         os.makedirs(cache_dir, exist_ok=True)
         
         # Paths for cached data
-        embeddings_path = os.path.join(cache_dir, 'embeddings.npz')
+        embeddings_path = os.path.join(cache_dir, 'embeddings.npy')
         index_path = os.path.join(cache_dir, 'policy_index.index')
-        metadata_path = os.path.join(cache_dir, 'metadata.json')
+        metadata_path = os.path.join(cache_dir, 'metadata.pkl')
         
         # Check if cached version exists
-        if os.path.exists(embeddings_path) and os.path.exists(index_path) and os.path.exists(metadata_path):
+        if os.path.exists(embeddings_path) and os.path.exists(metadata_path):
             print("Found cached embeddings and index, loading...")
-            self.embeddings = np.load(embeddings_path)['embeddings']
-            self.index = faiss.read_index(index_path)
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                self.questions = metadata['questions']
-                self.answers = metadata['answers']
-                self.sections = metadata['sections']
+            # Memory-map instead of eagerly reading the whole array; pages
+            # fault in on demand
+            self._index_from_cache(embeddings_path, index_path)
+            with open(metadata_path, 'rb') as f:
+                metadata = pickle.load(f)
+            self.questions = metadata['questions']
+            self.answers = metadata['answers']
+            self.sections = metadata['sections']
+            self._maybe_to_gpu()
+            self._loaded = True
             print(f"✅ Loaded cached index with {len(self.questions)} Q&A pairs")
             return
         
@@ -123,92 +386,234 @@ class PolicyVectorStore:
         print("Creating embeddings for questions...")
         start_time = time.time()
         
-        # Add "passage:" prefix for better embedding quality
-        question_passages = [f"passage: {q}" for q in self.questions]
+        # Prefix passages only for model families trained with prefixes
+        question_passages = [self._passage_prefix + q for q in self.questions]
         self.embeddings = self.model.encode(
             question_passages,
             convert_to_numpy=True,
-            show_progress_bar=True
+            show_progress_bar=True,
+            batch_size=64,
+            normalize_embeddings=True
         )
-        
-        # Normalize for cosine similarity
-        self.embeddings = self.embeddings / (np.linalg.norm(self.embeddings, axis=1, keepdims=True) + 1e-12)
+
+        # Normalization is fused into the encoder forward pass; inner
+        # product on unit vectors IS the cosine. Just pin down the
+        # contiguous float32 layout FAISS expects (normally a no-op view)
+        self.embeddings = np.ascontiguousarray(self.embeddings, dtype=np.float32)
         
         elapsed = time.time() - start_time
         print(f"✅ Created embeddings with shape {self.embeddings.shape} in {elapsed:.2f}s")
         
-        # Build FAISS index
+        # Build FAISS index. Flat search is O(N*d) per query, so past a few
+        # thousand entries switch to an HNSW graph (~log N at ~99% recall)
         print("Building FAISS index...")
         dimension = self.embeddings.shape[1]
-        self.index = faiss.IndexFlatL2(dimension)  # L2 distance
-        self.index.add(self.embeddings.astype('float32'))
-        print(f"✅ FAISS index built with {self.index.ntotal} vectors")
+        if self._quantize:
+            # int8 scalar quantizer: a quarter of the bytes per vector, and
+            # the flat scan is memory-bandwidth-bound, so throughput scales
+            # with it at negligible recall loss on MiniLM-size embeddings
+            self.index = faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+            self.index.train(self.embeddings)
+        elif len(self.questions) >= _HNSW_MIN_VECTORS:
+            self.index = faiss.IndexHNSWFlat(dimension, 32, faiss.METRIC_INNER_PRODUCT)
+            self.index.hnsw.efConstruction = 200
+        else:
+            # Flat case: inner product == cosine on unit vectors, and the
+            # NumPy path runs it straight off the embedding matrix, so no
+            # FAISS duplicate of the corpus is materialized at all
+            self.index = None
+        if self.index is not None:
+            # Add in fixed-size chunks: one giant add spikes FAISS's internal
+            # copy to the full matrix size, and chunking keeps the resident
+            # overhead flat without measurably changing build time
+            for i in range(0, len(self.embeddings), _ADD_CHUNK_ROWS):
+                self.index.add(np.ascontiguousarray(self.embeddings[i:i + _ADD_CHUNK_ROWS]))
+            print(f"✅ FAISS index built with {self.index.ntotal} vectors")
+        else:
+            print(f"✅ Flat search ready over {len(self.embeddings)} vectors")
         
         # Save to cache
-        np.savez_compressed(embeddings_path, embeddings=self.embeddings)
-        faiss.write_index(self.index, index_path)
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                'questions': self.questions,
-                'answers': self.answers,
-                'sections': self.sections
-            }, f, indent=2, ensure_ascii=False)
+        # Raw .npy: deflate on float32 embeddings buys almost nothing and
+        # costs CPU on every save/load
+        np.save(embeddings_path, self.embeddings)
+        if self.index is None:
+            # Flat index state is exactly embeddings.npy; drop any stale file
+            if os.path.exists(index_path):
+                os.remove(index_path)
+        else:
+            faiss.write_index(self.index, index_path)
+        # Pickle protocol 5 restores the three string lists at memcpy speed;
+        # pretty-printed JSON put a full tokenizer pass on every startup
+        metadata = {
+            'questions': self.questions,
+            'answers': self.answers,
+            'sections': self.sections
+        }
+        with open(metadata_path, 'wb') as f:
+            pickle.dump(metadata, f, protocol=5)
         print(f"✅ Index cached to {cache_dir}/")
+
+        # Move to GPU only after the CPU index has been written out
+        self._maybe_to_gpu()
+        self._loaded = True
     
     def load_index(self, cache_dir: str = 'vector_index'):
         """Load pre-built index from cache"""
         _ensure_rag_available()
         
-        embeddings_path = os.path.join(cache_dir, 'embeddings.npz')
+        embeddings_path = os.path.join(cache_dir, 'embeddings.npy')
         index_path = os.path.join(cache_dir, 'policy_index.index')
-        metadata_path = os.path.join(cache_dir, 'metadata.json')
+        metadata_path = os.path.join(cache_dir, 'metadata.pkl')
         
-        if not all(os.path.exists(p) for p in [embeddings_path, index_path, metadata_path]):
+        if not all(os.path.exists(p) for p in [embeddings_path, metadata_path]):
             raise FileNotFoundError(f"Index files not found in {cache_dir}/. Run build_index() first.")
         
         print(f"Loading index from {cache_dir}/...")
-        self.embeddings = np.load(embeddings_path)['embeddings']
-        self.index = faiss.read_index(index_path)
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-            self.questions = metadata['questions']
-            self.answers = metadata['answers']
-            self.sections = metadata['sections']
+        self._index_from_cache(embeddings_path, index_path)
+        with open(metadata_path, 'rb') as f:
+            metadata = pickle.load(f)
+        self.questions = metadata['questions']
+        self.answers = metadata['answers']
+        self.sections = metadata['sections']
+        self._maybe_to_gpu()
+        self._loaded = True
         print(f"✅ Loaded index with {len(self.questions)} Q&A pairs")
     
     def save_index(self, cache_dir: str = 'vector_index'):
         """Alias for compatibility - build_index already saves"""
         print(f"Index is already saved to {cache_dir}/")
     
-    def retrieve(self, query: str, top_k: int = 3):
-        """Retrieve top_k most relevant answers by matching query to questions"""
-        if self.index is None:
+    def embed_query(self, query: str):
+        """Encode one query into a normalized float32 vector.
+
+        Split out from retrieve() so callers can cache the encoder forward
+        pass and search with the precomputed vector."""
+        self._load_model()
+
+        # The encoder normalizes for cosine similarity as part of the
+        # forward pass; the query prefix applies only to models that use one
+        query_with_prefix = self._query_prefix + query
+        query_vec = self.model.encode([query_with_prefix], convert_to_numpy=True,
+                                      normalize_embeddings=True)
+        return np.ascontiguousarray(query_vec, dtype=np.float32)
+
+    def retrieve(self, query: str, top_k: int = 3, min_score: float = None):
+        """Retrieve top_k most relevant answers by matching query to questions.
+
+        Scores are cosine similarities (higher is better). When min_score is
+        given, weaker matches are dropped here so callers don't post-filter."""
+        if not self._loaded:
+            raise ValueError("Index not loaded. Call build_index() or load_index() first.")
+
+        return self.retrieve_by_vector(self.embed_query(query), top_k=top_k, min_score=min_score)
+
+    def _flat_search(self, query_vecs, top_k: int):
+        """Brute-force top-k over the embedding matrix in NumPy.
+
+        For a flat index the whole search is one GEMM plus a top-k select;
+        running it directly on the (memmapped) matrix skips FAISS's per-call
+        staging copy and the SWIG boundary, and argpartition keeps the
+        select linear in N. Returns (scores, indices) shaped like
+        faiss.Index.search so the callers don't care which path ran."""
+        sims = query_vecs @ self.embeddings.T
+        k = min(top_k, sims.shape[1])
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        row_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-row_scores, axis=1)
+        return (np.take_along_axis(row_scores, order, axis=1),
+                np.take_along_axis(top, order, axis=1))
+
+    def _use_numpy_search(self):
+        """True when search runs straight off the embedding matrix."""
+        if self._use_gpu or self.embeddings is None:
+            return False
+        return self.index is None or isinstance(self.index, faiss.IndexFlatIP)
+
+    def retrieve_by_vector(self, query_vec, top_k: int = 3, min_score: float = None):
+        """Retrieve with an already-embedded query vector (see embed_query)."""
+        if not self._loaded:
+            raise ValueError("Index not loaded. Call build_index() or load_index() first.")
+
+        if self._use_numpy_search():
+            scores, indices = self._flat_search(query_vec, top_k)
+        else:
+            if hasattr(self.index, 'hnsw'):
+                self.index.hnsw.efSearch = max(top_k * 4, 32)
+            scores, indices = self.index.search(query_vec, top_k)
+
+        return self._format_results(indices[0], scores[0], min_score)
+
+    def retrieve_async(self, query: str, top_k: int = 3, min_score: float = None) -> Future:
+        """Non-blocking retrieve for concurrent callers; returns a Future.
+
+        Submissions share one EncoderQueue, so requests arriving together
+        are encoded in a single batched forward; the search runs in the
+        queue worker's callback once the embedding lands. Use retrieve()
+        from single-threaded code."""
+        if not self._loaded:
             raise ValueError("Index not loaded. Call build_index() or load_index() first.")
-        
         self._load_model()
-        
-        # Encode query with "query:" prefix for better search
-        query_with_prefix = f"query: {query}"
-        query_vec = self.model.encode([query_with_prefix], convert_to_numpy=True)
-        
-        # Normalize for cosine similarity
-        query_vec = query_vec / (np.linalg.norm(query_vec, axis=1, keepdims=True) + 1e-12)
-        
-        # Search FAISS index
-        distances, indices = self.index.search(query_vec.astype('float32'), top_k)
-        
-        # Format results - return ANSWERS not questions
+        with self._queue_lock:
+            if self._encoder_queue is None:
+                self._encoder_queue = EncoderQueue(self)
+        vec_fut = self._encoder_queue.submit(self._query_prefix + query)
+
+        out = Future()
+
+        def _finish(fut):
+            try:
+                out.set_result(self.retrieve_by_vector(
+                    fut.result(), top_k=top_k, min_score=min_score))
+            except Exception as e:
+                out.set_exception(e)
+
+        vec_fut.add_done_callback(_finish)
+        return out
+
+    def retrieve_batch(self, queries, top_k: int = 3, min_score: float = None):
+        """Retrieve results for many queries with one encode and one search.
+
+        FAISS only goes multi-threaded across the rows of a query batch,
+        and the encoder amortizes its per-call overhead the same way, so
+        multi-query flows should come through here instead of looping
+        retrieve(). Returns one result list per query, in order."""
+        if not self._loaded:
+            raise ValueError("Index not loaded. Call build_index() or load_index() first.")
+
+        self._load_model()
+        query_vecs = self.model.encode(
+            [self._query_prefix + q for q in queries],
+            convert_to_numpy=True,
+            batch_size=32,
+            normalize_embeddings=True,
+        )
+        query_vecs = np.ascontiguousarray(query_vecs, dtype=np.float32)
+
+        if self._use_numpy_search():
+            scores, indices = self._flat_search(query_vecs, top_k)
+        else:
+            if hasattr(self.index, 'hnsw'):
+                self.index.hnsw.efSearch = max(top_k * 4, 32)
+            scores, indices = self.index.search(query_vecs, top_k)
+        return [self._format_results(idx_row, score_row, min_score)
+                for idx_row, score_row in zip(indices, scores)]
+
+    def _format_results(self, indices, scores, min_score=None):
+        """Format one query's search row - return ANSWERS not questions."""
         results = []
-        for rank, (idx, dist) in enumerate(zip(indices[0], distances[0])):
+        for rank, (idx, score) in enumerate(zip(indices, scores)):
+            if min_score is not None and score < min_score:
+                continue
             if idx < len(self.questions):  # Valid index
                 results.append({
                     'question': self.questions[idx],
                     'answer': self.answers[idx],
                     'section': self.sections[idx],
-                    'distance': float(dist),
+                    'score': float(score),
                     'rank': rank + 1
                 })
-        
+
         return results
     
     def get_context_for_query(self, query: str, max_context_length: int = 1500, top_k: int = 3) -> str:
@@ -219,31 +624,21 @@ class PolicyVectorStore:
             print(f"Warning: retrieval failed: {e}")
             return ''
         
-        # Build context string from Q&A pairs
-        context_parts = []
-        total_length = 0
-        
-        for r in results:
-            # Format: Question → Answer (from section)
-            section_text = f"Q: {r['question']}\nA: {r['answer']}\n[From: {r['section']}]"
-            if total_length + len(section_text) > max_context_length:
-                break
-            context_parts.append(section_text)
-            total_length += len(section_text)
-        
-        return '\n\n'.join(context_parts)
-
-
-# Backward compatibility
-def search(self, query: str, top_k: int = 5, max_distance: float = 2.0):
-    """Backward compatible search method"""
-    results = self.retrieve(query, top_k=top_k)
-    # Filter by distance threshold (lower is better)
-    filtered = [r for r in results if r['distance'] <= max_distance]
-    return [{'text': r['answer'], 'score': r['distance'], 'metadata': {'section': r['section'], 'question': r['question']}} 
-            for r in filtered]
+        # Format each Q&A pair once, then cut at the length budget with a
+        # prefix sum instead of a per-iteration counter and branch
+        parts = [f"Q: {r['question']}\nA: {r['answer']}\n[From: {r['section']}]"
+                 for r in results]
+        lens = np.cumsum([len(p) for p in parts])
+        keep = int(np.searchsorted(lens, max_context_length, side='right'))
+        return '\n\n'.join(parts[:keep])
 
-PolicyVectorStore.search = search
+    def search(self, query: str, top_k: int = 5, min_score: float = 0.0):
+        """Backward compatible search method"""
+        # The threshold is applied inside the store (higher score is better)
+        results = self.retrieve(query, top_k=top_k, min_score=min_score)
+        return [{'text': r['answer'], 'score': r['score'],
+                 'metadata': {'section': r['section'], 'question': r['question']}}
+                for r in results]
 
 
 
@@ -279,7 +674,7 @@ if __name__ == '__main__':
                 print(f"\n--- Query: '{query}' ---")
                 results = store.retrieve(query, top_k=2)
                 for r in results:
-                    print(f"  [{r['section']}] Distance: {r['distance']:.3f}")
+                    print(f"  [{r['section']}] Score: {r['score']:.3f}")
                     print(f"  Matched Q: {r['question'][:100]}...")
                     print(f"  Answer: {r['answer'][:150]}...")
             